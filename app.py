@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import time
+_IMPORT_T0 = time.perf_counter()
+
 import re
 import datetime as dt
 from pathlib import Path
@@ -7,15 +10,28 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.express as px
 
 from src.data import FetchConfig, fetch_markets
 from src.analytics import add_derived_columns
-from src.storage import load_recent
+from src.storage import load_range, load_recent, load_series
+from src.ringbuffer import DEFAULT_RING_PATH, SnapshotRing
+from src.perf import PerfLog, lazy_import, record_import
+from src.memo import ModuleMemo, snapshot_version
+from src.liquidity import concentration, concentration_history
+from src.downsample import downsample_series
+
+# plotly and bs4/lxml are imported lazily (see plotly_express() and src.data)
+# numpy/pandas/streamlit are already loaded by the Streamlit server, so this only measures src.*
+record_import("app.py src.* imports", time.perf_counter() - _IMPORT_T0)
 
 
 st.set_page_config(page_title="Alpha Terminal", page_icon="⚡", layout="wide")
 
+if "perf" not in st.session_state:
+    st.session_state["perf"] = PerfLog()
+perf: PerfLog = st.session_state["perf"]
+perf.start_run()
+
 
 COINBASE_CSS = """
 <style>
@@ -263,9 +279,47 @@ def load_live(source: str, per_page: int) -> pd.DataFrame:
     df = safe_df(df)
     df = add_price_range_bins(df)
     df = compute_reconstructed_prev_prices(df)
+    # new value on every real fetch, stable while the cached frame is reused
+    df.attrs["snapshot_version"] = f"{source}:{per_page}:{time.time_ns()}"
     return df
 
 
+@st.cache_resource
+def module_memo() -> ModuleMemo:
+    return ModuleMemo(max_entries=256, max_bytes=64 * 1024 * 1024)
+
+
+@st.cache_resource
+def open_ring(path: str) -> SnapshotRing:
+    return SnapshotRing(path)
+
+
+@st.cache_resource(ttl=300, max_entries=8, show_spinner=False)
+def load_history_series(coin_ids: tuple, field: str, mode: str) -> pd.DataFrame:
+    # full resolution, shared read-only; zooming slices this instead of going back to SQLite
+    s = load_series(list(coin_ids), field=field, mode=mode)
+    s["ts"] = pd.to_datetime(s["ts"], utc=True, format="ISO8601")
+    return s
+
+
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def history_view(coin_ids: tuple, field: str, mode: str, zoom: tuple | None, n_out: int, method: str) -> pd.DataFrame:
+    s = load_history_series(coin_ids, field, mode)
+    if zoom is not None:
+        s = s[(s["ts"] >= zoom[0]) & (s["ts"] <= zoom[1])]
+    return downsample_series(s, n_out, method)
+
+
+@st.cache_data(ttl=300, max_entries=16, show_spinner=False)
+def concentration_over_time(start: str, mode: str) -> pd.DataFrame:
+    # full snapshots from load_range, not the row-capped load_recent, so no ts is partial
+    return concentration_history(load_range(start=start, mode=mode, columns=["ts", "price", "volume_24h"]))
+
+
+def plotly_express():
+    return lazy_import("plotly.express")
+
+
 def valid_name(s: str) -> bool:
     s = (s or "").strip()
     if len(s) <= 2 or len(s) >= 11:
@@ -280,6 +334,10 @@ with st.sidebar:
     st.divider()
     export_now = st.button("Export current data to Excel", use_container_width=True)
     show_history = st.checkbox("Show SQLite snapshots", value=False)
+    st.divider()
+    active_only = st.toggle("Render active module only", value=False,
+                            help="Faster reruns: only the selected module is computed and drawn.")
+    show_perf = st.checkbox("Show performance report", value=False)
 
 
 st.title("⚡ Alpha Terminal")
@@ -293,7 +351,9 @@ with c2:
 with c3:
     st.markdown("<span class='badge'><span class='dot'></span> Focused on 6 investor requirements</span>", unsafe_allow_html=True)
 
-df = load_live(source, per_page)
+with perf.timed("load_live"):
+    df = load_live(source, per_page)
+memo = module_memo()
 
 if df is None or df.empty:
     st.error("No data loaded. Try switching the data source or lowering the coin count.")
@@ -315,30 +375,47 @@ if export_now:
     st.success(f"Exported: {fname} (engine={engine})")
 
 
-tabs = st.tabs([
+MODULES = [
     "1) Budget KPIs",
     "2) $0–$5 Top 10",
     "3) Top Increase (1h)",
     "4) Prefix + Working Hours",
     "5) Compare 2 Coins",
     "6) Liquidity Pie",
-])
+]
+
+
+# each module is a fragment: its own widgets rerun only that module, not the whole script.
+# the *_view functions hold the computation + figure and are memoized per (snapshot, module, inputs).
+def budget_kpis_view(df: pd.DataFrame, selected_ranges: tuple) -> dict | None:
+    f = df[df["price_range"].isin(selected_ranges)].copy() if selected_ranges else df.iloc[0:0].copy()
+    f = f.dropna(subset=["avg_downfall_pct", "price"])
+    if f.empty:
+        return None
+
+    best = f.sort_values("avg_downfall_pct", ascending=True).iloc[0]
+    show = f.sort_values("avg_downfall_pct").head(25)[
+        ["coin_name", "coin_symbol", "price", "pct_1h", "pct_24h", "pct_7d", "avg_downfall_pct", "volume_24h", "market_cap"]
+    ].copy()
+    return {"best": best, "count": int(f.shape[0]), "table": show}
 
 
-with tabs[0]:
+@st.fragment
+@perf.time_calls(MODULES[0])
+def render_budget_kpis(df: pd.DataFrame) -> None:
     st.subheader("1) Budget KPIs (price range slicer)")
     st.caption("Investor wants maximum profit with low budget → show the coin with the least average downfall in the selected price range.")
 
     ranges = ["$0 - $0.05", "$0.05 - $0.5", "$0.5 - $5", "$5 - $50", ">$50"]
     selected_ranges = st.multiselect("Price ranges ($)", ranges, default=["$0.5 - $5", "$5 - $50"])
 
-    f = df[df["price_range"].isin(selected_ranges)].copy() if selected_ranges else df.iloc[0:0].copy()
-    f = f.dropna(subset=["avg_downfall_pct", "price"])
+    view = memo.get_or_compute(snapshot_version(df), "budget_kpis", selected_ranges,
+                               budget_kpis_view, df, tuple(selected_ranges))
 
-    if f.empty:
+    if view is None:
         st.info("Select at least one price range.")
     else:
-        best = f.sort_values("avg_downfall_pct", ascending=True).iloc[0]
+        best = view["best"]
 
         st.markdown(
             f"""
@@ -347,105 +424,150 @@ with tabs[0]:
   <div class="kpi"><div class="label">Symbol</div><div class="value">{str(best.get("coin_symbol","—")).upper()}</div><div class="hint">Ticker</div></div>
   <div class="kpi"><div class="label">Current Price</div><div class="value">{fmt_usd(best.get("price"))}</div><div class="hint">USD</div></div>
   <div class="kpi"><div class="label">Avg Downfall %</div><div class="value">{fmt_pct(best.get("avg_downfall_pct"))}</div><div class="hint">Avg(|1h|,|24h|,|7d|)</div></div>
-  <div class="kpi"><div class="label">Coins Considered</div><div class="value">{int(f.shape[0])}</div><div class="hint">Records in selection</div></div>
+  <div class="kpi"><div class="label">Coins Considered</div><div class="value">{view["count"]}</div><div class="hint">Records in selection</div></div>
 </div>
 """,
             unsafe_allow_html=True
         )
 
-        show = f.sort_values("avg_downfall_pct").head(25)[
-            ["coin_name", "coin_symbol", "price", "pct_1h", "pct_24h", "pct_7d", "avg_downfall_pct", "volume_24h", "market_cap"]
-        ].copy()
-        st.dataframe(show, use_container_width=True, height=460)
+        st.dataframe(view["table"], use_container_width=True, height=460)
 
 
-with tabs[1]:
-    st.subheader("2) $0–$5 coins: top 10 (by 1h-before price)")
-    st.caption("Within $0–$5, show top 10 coins based on 1h-before price. Chart compares 7d-before and 24h-before prices vs current.")
-
+def top10_0_5_view(df: pd.DataFrame) -> dict | None:
     d = df[(df["price"] >= 0) & (df["price"] <= 5)].copy()
     d = d.dropna(subset=["prev_price_1h", "prev_price_24h", "prev_price_7d", "price"])
     d = d.sort_values("prev_price_1h", ascending=False).head(10)
-
     if d.empty:
-        st.warning("No coins found in $0–$5 range.")
-    else:
-        chart = d[["coin_name", "prev_price_7d", "prev_price_24h", "price"]].copy()
-        fig = px.bar(
-            chart,
-            x="coin_name",
-            y=["prev_price_7d", "prev_price_24h", "price"],
-            barmode="group",
-            title="Top 10 ($0–$5): 7d-before vs 24h-before vs Current"
-        )
-        fig.update_layout(height=520, margin=dict(l=10, r=10, t=50, b=10), legend_title_text="Price")
-        st.plotly_chart(fig, use_container_width=True)
+        return None
+
+    chart = d[["coin_name", "prev_price_7d", "prev_price_24h", "price"]].copy()
+    fig = plotly_express().bar(
+        chart,
+        x="coin_name",
+        y=["prev_price_7d", "prev_price_24h", "price"],
+        barmode="group",
+        title="Top 10 ($0–$5): 7d-before vs 24h-before vs Current"
+    )
+    fig.update_layout(height=520, margin=dict(l=10, r=10, t=50, b=10), legend_title_text="Price")
+    table = d[["coin_name", "coin_symbol", "price", "prev_price_1h", "prev_price_24h", "prev_price_7d"]]
+    return {"fig": fig, "table": table}
 
-        st.dataframe(
-            d[["coin_name", "coin_symbol", "price", "prev_price_1h", "prev_price_24h", "prev_price_7d"]],
-            use_container_width=True,
-            height=420
-        )
 
+@st.fragment
+@perf.time_calls(MODULES[1])
+def render_top10_0_5(df: pd.DataFrame) -> None:
+    st.subheader("2) $0–$5 coins: top 10 (by 1h-before price)")
+    st.caption("Within $0–$5, show top 10 coins based on 1h-before price. Chart compares 7d-before and 24h-before prices vs current.")
 
-with tabs[2]:
-    st.subheader("3) Top 10 price increase vs previous 1 hour")
-    st.caption("Assume 1h % is positive change. Show biggest price increase coins, and compare current vs 1h-before.")
+    view = memo.get_or_compute(snapshot_version(df), "top10_0_5", (), top10_0_5_view, df)
+
+    if view is None:
+        st.warning("No coins found in $0–$5 range.")
+    else:
+        st.plotly_chart(view["fig"], use_container_width=True)
+        st.dataframe(view["table"], use_container_width=True, height=420)
 
-    cat = st.radio("Price category", ["< $10", ">= $10"], horizontal=True, index=0)
 
+def top_increase_view(df: pd.DataFrame, cat: str) -> dict | None:
     d = df.dropna(subset=["price", "prev_price_1h"]).copy()
     d["price_category_10"] = np.where(d["price"] >= 10, ">= $10", "< $10")
     d = d[d["price_category_10"] == cat].copy()
     d["price_change_1h"] = d["price"] - d["prev_price_1h"]
     d = d.sort_values("price_change_1h", ascending=False).head(10)
-
     if d.empty:
+        return None
+
+    fig = plotly_express().bar(
+        d,
+        x="coin_symbol",
+        y=["prev_price_1h", "price"],
+        barmode="group",
+        title="Top 10: Current vs 1h-before (by price increase)"
+    )
+    fig.update_layout(height=520, margin=dict(l=10, r=10, t=50, b=10), legend_title_text="Price")
+
+    table = d[["coin_symbol", "coin_name", "price_change_1h"]].copy()
+    table["price_change_1h"] = table["price_change_1h"].map(lambda x: f"${x:,.6f}" if x < 1 else f"${x:,.2f}")
+    return {"fig": fig, "table": table}
+
+
+@st.fragment
+@perf.time_calls(MODULES[2])
+def render_top_increase(df: pd.DataFrame) -> None:
+    st.subheader("3) Top 10 price increase vs previous 1 hour")
+    st.caption("Assume 1h % is positive change. Show biggest price increase coins, and compare current vs 1h-before.")
+
+    cat = st.radio("Price category", ["< $10", ">= $10"], horizontal=True, index=0)
+
+    view = memo.get_or_compute(snapshot_version(df), "top_increase", cat, top_increase_view, df, cat)
+
+    if view is None:
         st.warning("No data for selected category.")
     else:
-        fig = px.bar(
-            d,
-            x="coin_symbol",
-            y=["prev_price_1h", "price"],
-            barmode="group",
-            title="Top 10: Current vs 1h-before (by price increase)"
-        )
-        fig.update_layout(height=520, margin=dict(l=10, r=10, t=50, b=10), legend_title_text="Price")
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(view["fig"], use_container_width=True)
+        st.dataframe(view["table"], use_container_width=True, height=360)
+
 
-        table = d[["coin_symbol", "coin_name", "price_change_1h"]].copy()
-        table["price_change_1h"] = table["price_change_1h"].map(lambda x: f"${x:,.6f}" if x < 1 else f"${x:,.2f}")
-        st.dataframe(table, use_container_width=True, height=360)
+def prefix_volume_view(df: pd.DataFrame) -> dict:
+    d = df.copy()
+    d = d[d["coin_name"].astype(str).str.match(r"^[AEIOUaeiouBCDbdc]")].copy()
+    d = d.dropna(subset=["volume_24h"]).sort_values("volume_24h", ascending=False).head(10)
+
+    fig = plotly_express().bar(
+        d.sort_values("volume_24h", ascending=True),
+        x="volume_24h",
+        y="coin_name",
+        orientation="h",
+        title="Top 10 Liquidity (Volume 24h)"
+    )
+    fig.update_layout(height=520, margin=dict(l=10, r=10, t=50, b=10), xaxis_title="Volume(24h)", yaxis_title="")
+    return {"fig": fig, "table": d[["coin_name", "coin_symbol", "volume_24h", "price"]]}
 
 
-with tabs[3]:
+@st.fragment
+@perf.time_calls(MODULES[3])
+def render_prefix_working_hours(df: pd.DataFrame) -> None:
     st.subheader("4) Prefix filter + Working hours security")
     st.caption("Coins starting with vowels OR B/C/D. Chart visible only from 9 AM to 5 PM (local time).")
 
     now = dt.datetime.now()
     in_work_hours = 9 <= now.hour < 17
 
-    d = df.copy()
-    d = d[d["coin_name"].astype(str).str.match(r"^[AEIOUaeiouBCDbdc]")].copy()
-    d = d.dropna(subset=["volume_24h"]).sort_values("volume_24h", ascending=False).head(10)
-
     if not in_work_hours:
         st.warning("Please open in working hours ( 9 am to 5 pm )")
     else:
-        fig = px.bar(
-            d.sort_values("volume_24h", ascending=True),
-            x="volume_24h",
-            y="coin_name",
-            orientation="h",
-            title="Top 10 Liquidity (Volume 24h)"
-        )
-        fig.update_layout(height=520, margin=dict(l=10, r=10, t=50, b=10), xaxis_title="Volume(24h)", yaxis_title="")
-        st.plotly_chart(fig, use_container_width=True)
-
-        st.dataframe(d[["coin_name", "coin_symbol", "volume_24h", "price"]], use_container_width=True, height=360)
+        view = memo.get_or_compute(snapshot_version(df), "prefix_volume", (), prefix_volume_view, df)
+        st.plotly_chart(view["fig"], use_container_width=True)
+        st.dataframe(view["table"], use_container_width=True, height=360)
 
 
-with tabs[4]:
+def compare_two_view(df: pd.DataFrame, name1: str, name2: str) -> dict | None:
+    d = df.copy()
+    d["nm"] = d["coin_name"].astype(str).str.lower().str.strip()
+    a = d[d["nm"] == name1.lower().strip()]
+    b = d[d["nm"] == name2.lower().strip()]
+    if a.empty or b.empty:
+        return None
+
+    a = a.iloc[0]
+    b = b.iloc[0]
+
+    table = pd.DataFrame({
+        "Field": ["Symbol", "Price", "Volume(24h)", "Market Cap", "Circulating Supply"],
+        "CoinName1": [a.get("coin_symbol"), a.get("price"), a.get("volume_24h"), a.get("market_cap"), a.get("circulating_supply")],
+        "CoinName2": [b.get("coin_symbol"), b.get("price"), b.get("volume_24h"), b.get("market_cap"), b.get("circulating_supply")],
+    })
+    diff = {
+        "volume": float(a.get("volume_24h", 0) - b.get("volume_24h", 0)),
+        "supply": float(a.get("circulating_supply", 0) - b.get("circulating_supply", 0)),
+        "market_cap": float(a.get("market_cap", 0) - b.get("market_cap", 0)),
+    }
+    return {"table": table, "diff": diff}
+
+
+@st.fragment
+@perf.time_calls(MODULES[4])
+def render_compare_two(df: pd.DataFrame) -> None:
     st.subheader("5) Compare two coins")
     st.caption("Enter two coin names. Shows fields + KPI differences. Validation: 3–10 characters, no numbers.")
 
@@ -458,62 +580,186 @@ with tabs[4]:
     if not valid_name(name1) or not valid_name(name2):
         st.error("Invalid input. Coin name must be 3–10 characters and contain no numbers.")
     else:
-        d = df.copy()
-        d["nm"] = d["coin_name"].astype(str).str.lower().str.strip()
-        a = d[d["nm"] == name1.lower().strip()]
-        b = d[d["nm"] == name2.lower().strip()]
+        view = memo.get_or_compute(snapshot_version(df), "compare_two", (name1, name2),
+                                   compare_two_view, df, name1, name2)
 
-        if a.empty or b.empty:
+        if view is None:
             st.error("One or both coin names not found in current live dataset.")
         else:
-            a = a.iloc[0]
-            b = b.iloc[0]
-
-            table = pd.DataFrame({
-                "Field": ["Symbol", "Price", "Volume(24h)", "Market Cap", "Circulating Supply"],
-                "CoinName1": [a.get("coin_symbol"), a.get("price"), a.get("volume_24h"), a.get("market_cap"), a.get("circulating_supply")],
-                "CoinName2": [b.get("coin_symbol"), b.get("price"), b.get("volume_24h"), b.get("market_cap"), b.get("circulating_supply")],
-            })
-            st.dataframe(table, use_container_width=True, height=240)
+            st.dataframe(view["table"], use_container_width=True, height=240)
 
             k1, k2, k3 = st.columns(3)
-            k1.metric("Volume Diff", f"{float(a.get('volume_24h', 0) - b.get('volume_24h', 0)):,.0f}")
-            k2.metric("Supply Diff", f"{float(a.get('circulating_supply', 0) - b.get('circulating_supply', 0)):,.0f}")
-            k3.metric("Market Cap Diff", f"{float(a.get('market_cap', 0) - b.get('market_cap', 0)):,.0f}")
+            k1.metric("Volume Diff", f"{view['diff']['volume']:,.0f}")
+            k2.metric("Supply Diff", f"{view['diff']['supply']:,.0f}")
+            k3.metric("Market Cap Diff", f"{view['diff']['market_cap']:,.0f}")
+
+
+def liquidity_pie_view(df: pd.DataFrame, cat: str) -> dict | None:
+    d = df.dropna(subset=["price", "volume_24h"]).copy()
+    d["cat0_50"] = np.where(d["price"] <= 50, "$0 - $50", ">$50")
+    d = d[d["cat0_50"] == cat].copy()
+    d = d.sort_values("volume_24h", ascending=False)
+    if d.empty:
+        return None
+
+    top5 = d.head(5)[["coin_name", "volume_24h"]].copy()
+    other_sum = float(d.iloc[5:]["volume_24h"].sum()) if d.shape[0] > 5 else 0.0
+
+    pie = top5.copy()
+    if other_sum > 0:
+        pie = pd.concat([pie, pd.DataFrame([{"coin_name": "Others", "volume_24h": other_sum}])], ignore_index=True)
 
+    fig = plotly_express().pie(pie, names="coin_name", values="volume_24h", title="Liquidity Share (Volume 24h)")
+    fig.update_traces(textposition="inside", textinfo="percent+label")
+    fig.update_layout(height=560, margin=dict(l=10, r=10, t=60, b=10))
+    table = d.head(25)[["coin_name", "coin_symbol", "price", "volume_24h", "market_cap"]]
+    return {"fig": fig, "table": table}
 
-with tabs[5]:
+
+@st.fragment
+@perf.time_calls(MODULES[5])
+def render_liquidity_pie(df: pd.DataFrame) -> None:
     st.subheader("6) Liquidity pie: Top 5 coins share + Others")
     st.caption("Slicer: $0–$50 or >$50 (based on price). Pie chart uses Volume(24h) as liquidity.")
 
     cat = st.radio("Price category", ["$0 - $50", ">$50"], horizontal=True, index=0)
 
-    d = df.dropna(subset=["price", "volume_24h"]).copy()
-    d["cat0_50"] = np.where(d["price"] <= 50, "$0 - $50", ">$50")
-    d = d[d["cat0_50"] == cat].copy()
-    d = d.sort_values("volume_24h", ascending=False)
+    view = memo.get_or_compute(snapshot_version(df), "liquidity_pie", cat, liquidity_pie_view, df, cat)
 
-    if d.empty:
+    if view is None:
         st.warning("No data for selected category.")
     else:
-        top5 = d.head(5)[["coin_name", "volume_24h"]].copy()
-        other_sum = float(d.iloc[5:]["volume_24h"].sum()) if d.shape[0] > 5 else 0.0
+        st.plotly_chart(view["fig"], use_container_width=True)
+        st.dataframe(view["table"], use_container_width=True, height=420)
+
+    st.caption("Liquidity concentration by price bucket (top-5 share, HHI 0–10,000, Gini)")
+    conc = memo.get_or_compute(snapshot_version(df), "liquidity_concentration", (),
+                               concentration, df, ["price_range"], "volume_24h", 5)
+    st.dataframe(conc, use_container_width=True, hide_index=True)
+
 
-        pie = top5.copy()
-        if other_sum > 0:
-            pie = pd.concat([pie, pd.DataFrame([{"coin_name": "Others", "volume_24h": other_sum}])], ignore_index=True)
+RENDERERS = [
+    render_budget_kpis,
+    render_top10_0_5,
+    render_top_increase,
+    render_prefix_working_hours,
+    render_compare_two,
+    render_liquidity_pie,
+]
 
-        fig = px.pie(pie, names="coin_name", values="volume_24h", title="Liquidity Share (Volume 24h)")
-        fig.update_traces(textposition="inside", textinfo="percent+label")
-        fig.update_layout(height=560, margin=dict(l=10, r=10, t=60, b=10))
-        st.plotly_chart(fig, use_container_width=True)
 
-        st.dataframe(d.head(25)[["coin_name", "coin_symbol", "price", "volume_24h", "market_cap"]], use_container_width=True, height=420)
+if active_only:
+    # st.tabs always executes every tab body, so pick the module with a radio instead
+    active = st.radio("Module", MODULES, horizontal=True, label_visibility="collapsed")
+    RENDERERS[MODULES.index(active)](df)
+else:
+    tabs = st.tabs(MODULES)
+    for tab, render in zip(tabs, RENDERERS):
+        with tab:
+            render(df)
 
 
 if show_history:
     st.divider()
     st.subheader("SQLite Recent Snapshots")
     st.caption("This shows any logged snapshots stored by your logger.py pipeline.")
-    hist = load_recent()
+    storage = st.radio("Storage schema", ["wide", "normalized"], horizontal=True, index=0,
+                       help="Match logger.py --storage")
+    with perf.timed("load_recent"):
+        hist = load_recent(mode=storage)
     st.dataframe(hist.head(200), use_container_width=True, height=420)
+
+    if not hist.empty:
+        days = st.slider("Concentration history (days)", 1, 365, 30)
+        # day-aligned so the cache key only changes once a day, not on every logger tick
+        start = (pd.to_datetime(hist["ts"].max(), utc=True).floor("D") - pd.Timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        conc = concentration_over_time(start, storage)
+        if not conc.empty:
+            fig = plotly_express().line(conc, x="ts", y="hhi", color="price_range",
+                                        title="Liquidity concentration over time (HHI of Volume 24h)")
+            fig.update_layout(height=420, margin=dict(l=10, r=10, t=50, b=10), xaxis_title="", legend_title_text="Price range")
+            st.plotly_chart(fig, use_container_width=True)
+
+    if not hist.empty and "coin_id" in hist.columns:
+        st.subheader("History chart")
+        st.caption("Each series is downsampled server-side to the point budget. Box-select a range on the chart to zoom in at full detail.")
+
+        latest = hist[hist["ts"] == hist["ts"].max()].sort_values("market_cap", ascending=False)
+        coin_options = sorted(hist["coin_id"].dropna().unique())
+        h1, h2, h3 = st.columns([2.2, 1, 1])
+        with h1:
+            coins = st.multiselect("Coins", coin_options, default=latest["coin_id"].dropna().head(5).tolist())
+        with h2:
+            field = st.selectbox("Field", ["price", "volume_24h", "market_cap"], index=0)
+        with h3:
+            method = st.radio("Downsampling", ["lttb", "minmax"], horizontal=True, index=0)
+        n_out = st.slider("Points per series (≈ chart width in px)", 200, 4000, 1200, step=100)
+
+        zoom = st.session_state.get("hist_zoom")
+        gen = st.session_state.get("hist_chart_gen", 0)
+        if coins:
+            with perf.timed("history_chart"):
+                view = history_view(tuple(sorted(coins)), field, storage, zoom, n_out, method)
+                fig = plotly_express().line(view, x="ts", y="value", color="coin_id", render_mode="webgl",
+                                            title=f"{field} history ({len(view):,} points drawn)")
+                fig.update_layout(height=480, margin=dict(l=10, r=10, t=50, b=10), xaxis_title="", yaxis_title=field,
+                                  legend_title_text="Coin", dragmode="select")
+            event = st.plotly_chart(fig, use_container_width=True, on_select="rerun", selection_mode="box",
+                                    key=f"hist_chart_{gen}")
+
+            boxes = event.selection.get("box", []) if event else []
+            if boxes:
+                x0, x1 = sorted(pd.to_datetime(boxes[0]["x"], utc=True))
+                st.session_state["hist_zoom"] = (x0, x1)
+                # new key drops the old selection so it isn't re-applied on the next run
+                st.session_state["hist_chart_gen"] = gen + 1
+                st.rerun()
+
+        if zoom is not None and st.button("Reset zoom"):
+            st.session_state["hist_zoom"] = None
+            st.session_state["hist_chart_gen"] = gen + 1
+            st.rerun()
+
+    if Path(DEFAULT_RING_PATH).exists():
+        st.subheader("Recent window (shared-memory ring buffer)")
+        st.caption("Rolling price stats read straight from the logger's memory-mapped ring buffer — no SQL round-trip.")
+        window = st.slider("Snapshots in window", 4, 96, 16, step=4)
+        try:
+            ring = open_ring(DEFAULT_RING_PATH)
+            stats = ring.rolling_stats("price", n=window)
+            recent = ring.recent_frame(stats["coin_id"].head(5).tolist(), "price", n=window)
+        except (RuntimeError, ValueError) as e:
+            st.warning(f"Ring buffer unavailable: {e}")
+        else:
+            if not recent.empty:
+                fig = plotly_express().line(recent, x="ts", y="value", color="coin_id",
+                                            title="Recent window: price (top 5 by last price)")
+                fig.update_layout(height=420, margin=dict(l=10, r=10, t=50, b=10), xaxis_title="", yaxis_title="price",
+                                  legend_title_text="Coin")
+                st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(stats, use_container_width=True, height=420)
+
+
+
+perf.end_run()
+if show_perf:
+    with st.sidebar:
+        st.divider()
+        st.subheader("Performance")
+        summary = perf.rerun_summary()
+        p1, p2 = st.columns(2)
+        p1.metric("Last rerun", f"{summary['last_ms']:.0f} ms")
+        p2.metric("Mean rerun", f"{summary['mean_ms']:.0f} ms", help=f"Over last {summary['runs']} full reruns")
+        st.caption("Import time (cold start)")
+        st.dataframe(perf.import_report(), use_container_width=True, hide_index=True)
+        st.caption("This rerun, by section")
+        st.dataframe(perf.rerun_report(), use_container_width=True, hide_index=True)
+        st.caption("Recent module runs, newest first (includes reruns of a single module)")
+        st.dataframe(perf.interaction_report(), use_container_width=True, hide_index=True)
+        st.caption("Module memo (shared across sessions)")
+        memo_stats = memo.stats()
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Hits", memo_stats["hits"])
+        m2.metric("Misses", memo_stats["misses"])
+        m3.metric("Hit rate", f"{memo_stats['hit_rate']:.0%}")
+        st.caption(f"{memo_stats['entries']} entries • {memo_stats['bytes'] / 1e6:.1f} MB • {memo_stats['evictions']} evicted")
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.analytics import (
+    add_derived_columns,
+    filter_by_price_ranges,
+    filter_name_prefix,
+    kpi_least_avg_downfall,
+    pie_top5_volume_with_others,
+    top10_by_volume,
+    top10_for_range_0_5_prev_prices,
+    top10_price_increase,
+)
+from src.storage import ensure_ts_index, list_timestamps, load_range
+
+
+TABLES = ["budget_kpi", "top10_0_5", "top_increase", "liquidity_pie", "prefix_volume"]
+
+
+WINDOWS = {"hour": "h", "day": "D", "week": "W"}
+
+
+def _window_starts(timestamps: List[str], window: str) -> pd.DatetimeIndex:
+    t = pd.to_datetime(pd.Index(timestamps), utc=True)
+    if window == "week":
+        # weeks start on Monday 00:00 UTC
+        t = t.floor("D")
+        return t - pd.to_timedelta(t.dayofweek, unit="D")
+    return t.floor(WINDOWS[window])
+
+
+def partition_bounds(timestamps: List[str], window: str = "day", start: Optional[str] = None,
+                     end: Optional[str] = None) -> List[Tuple[str, str, str, int]]:
+    """(start, end, last, count) per fixed UTC ``window``: ``start <= ts < end``, ``last`` the newest
+    ts the partition covers and ``count`` how many snapshots it holds.
+
+    Windows sit on calendar boundaries (clipped to the requested ``start``/``end``), so newly
+    logged snapshots only change the bound of the window they land in.
+    """
+    if not timestamps:
+        return []
+    ts = pd.Series(timestamps)
+    opened = _window_starts(timestamps, window)
+    step = pd.Timedelta(weeks=1) if window == "week" else pd.Timedelta(1, unit=WINDOWS[window])
+    fmt = "%Y-%m-%dT%H:%M:%SZ"
+    bounds = []
+    for w, group in ts.groupby(opened, sort=True):
+        lo = w.strftime(fmt)
+        hi = (w + step).strftime(fmt)
+        if start is not None and start > lo:
+            lo = start
+        if end is not None and end < hi:
+            hi = end
+        bounds.append((lo, hi, group.max(), len(group)))
+    return bounds
+
+
+def analyze_partition(db_path: str, storage: str, start: str, end: Optional[str], last: str,
+                      ranges: List[str], out_path: str) -> Tuple[str, int, float]:
+    t0 = time.perf_counter()
+    hist = load_range(db_path, start=start, end=end, mode=storage)
+    # snapshots logged after partitioning belong to the next run, not this checkpoint
+    hist = hist[hist["ts"] <= last]
+    rows: Dict[str, List[pd.DataFrame]] = {name: [] for name in TABLES if name != "budget_kpi"}
+    kpis = []
+    n_snapshots = 0
+
+    if not hist.empty:
+        hist = add_derived_columns(hist)
+        for ts, snap in hist.groupby("ts", sort=True):
+            n_snapshots += 1
+            kpis.append({"ts": ts, **kpi_least_avg_downfall(filter_by_price_ranges(snap, ranges))})
+            rows["top10_0_5"].append(top10_for_range_0_5_prev_prices(snap).assign(ts=ts))
+            for cat in ["< $10", ">= $10"]:
+                rows["top_increase"].append(top10_price_increase(snap, cat).assign(ts=ts, price_category=cat))
+            for cat in ["$0 - $50", ">$50"]:
+                rows["liquidity_pie"].append(pie_top5_volume_with_others(snap, cat).assign(ts=ts, price_category=cat))
+            rows["prefix_volume"].append(top10_by_volume(filter_name_prefix(snap)).assign(ts=ts))
+
+    tables = {name: pd.concat(parts, ignore_index=True) if parts else pd.DataFrame() for name, parts in rows.items()}
+    tables["budget_kpi"] = pd.DataFrame(kpis)
+
+    # write-then-rename so a killed run never leaves a half-written checkpoint
+    tmp = out_path + ".tmp"
+    pd.to_pickle(tables, tmp)
+    os.replace(tmp, out_path)
+    return start, n_snapshots, time.perf_counter() - t0
+
+
+def _short_hash(payload) -> str:
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def checkpoint_dir(out_dir: Path, args) -> Path:
+    return out_dir / "checkpoints" / _short_hash({
+        "db_path": os.path.abspath(args.db_path),
+        "storage": args.storage,
+        "ranges": args.ranges,
+    })
+
+
+def checkpoint_name(bound: Tuple[str, Optional[str], str, int]) -> str:
+    # last ts and snapshot count are part of the name, so a partition that grew is recomputed
+    return f"part_{_short_hash(list(bound))}.pkl"
+
+
+def write_tables(tables: Dict[str, pd.DataFrame], out_dir: Path, fmt: str) -> List[Path]:
+    written = []
+    for name, table in tables.items():
+        if fmt == "parquet":
+            path = out_dir / f"{name}.parquet"
+            table.to_parquet(path, index=False)
+        else:
+            path = out_dir / f"{name}.csv"
+            table.to_csv(path, index=False)
+        written.append(path)
+    return written
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Run the dashboard analytics over logged snapshots in parallel.")
+    ap.add_argument("--db_path", default="data/crypto.db")
+    ap.add_argument("--storage", default="wide", choices=["wide", "normalized"])
+    ap.add_argument("--start", default=None, help="first ts to include (ISO, inclusive)")
+    ap.add_argument("--end", default=None, help="last ts to include (ISO, exclusive)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--window", default="day", choices=list(WINDOWS),
+                    help="partition size; each UTC hour/day/week is checkpointed separately")
+    ap.add_argument("--ranges", nargs="+", default=["$0.5 - $5", "$5 - $50"], help="price ranges for the Budget KPI")
+    ap.add_argument("--out_dir", default="exports/batch")
+    ap.add_argument("--format", default="csv", choices=["csv", "parquet"])
+    ap.add_argument("--fresh", action="store_true", help="ignore checkpoints from an earlier run")
+    args = ap.parse_args()
+
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except Exception:
+            ap.error("--format parquet needs pyarrow (pip install pyarrow)")
+
+    if args.storage == "wide":
+        ensure_ts_index(args.db_path)
+    timestamps = [
+        ts for ts in list_timestamps(args.db_path, mode=args.storage)
+        if (args.start is None or ts >= args.start) and (args.end is None or ts < args.end)
+    ]
+    if not timestamps:
+        print("No snapshots in the selected range.")
+        return
+
+    bounds = partition_bounds(timestamps, args.window, args.start, args.end)
+
+    out_dir = Path(args.out_dir)
+    ckpt = checkpoint_dir(out_dir, args)
+    ckpt.mkdir(parents=True, exist_ok=True)
+    part_paths = [str(ckpt / checkpoint_name(b)) for b in bounds]
+    if args.fresh:
+        for p in part_paths:
+            Path(p).unlink(missing_ok=True)
+    # partitions that grew since the last run get a new name; drop the files nothing points at
+    keep = {Path(p).name for p in part_paths}
+    stale = [p for p in ckpt.glob("part_*.pkl*") if p.name not in keep]
+    for p in stale:
+        p.unlink(missing_ok=True)
+
+    todo = [i for i, p in enumerate(part_paths) if not Path(p).exists()]
+    done = len(bounds) - len(todo)
+    print(f"{len(timestamps)} snapshots in {len(bounds)} {args.window} partitions, {done} already checkpointed, "
+          f"{len(stale)} stale removed, {args.workers} workers")
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(analyze_partition, args.db_path, args.storage, bounds[i][0], bounds[i][1], bounds[i][2],
+                        args.ranges, part_paths[i]): i
+            for i in todo
+        }
+        for fut in as_completed(futures):
+            start, n, secs = fut.result()
+            done += 1
+            print(f"[{done}/{len(bounds)}] {start}: {n} snapshots in {secs:.1f}s "
+                  f"(elapsed {time.perf_counter() - t0:.1f}s)")
+
+    parts = [pd.read_pickle(p) for p in part_paths]
+    merged = {
+        name: pd.concat([p[name] for p in parts if not p[name].empty], ignore_index=True)
+        if any(not p[name].empty for p in parts) else pd.DataFrame()
+        for name in TABLES
+    }
+    for path in write_tables(merged, out_dir, args.format):
+        print(f"wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.storage import append_snapshot, load_recent
+
+
+def simulated_snapshots(n_coins: int, days: int, every_minutes: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    ids = [f"coin-{i:04d}" for i in range(n_coins)]
+    names = [f"Simulated Coin {i}" for i in range(n_coins)]
+    symbols = [f"SC{i}" for i in range(n_coins)]
+    price = rng.lognormal(0, 3, n_coins)
+    supply = rng.lognormal(18, 2, n_coins).round()
+    start = dt.datetime(2025, 1, 1)
+    steps = days * 24 * 60 // every_minutes
+    for step in range(steps):
+        price = price * np.exp(rng.normal(0, 0.004, n_coins))
+        # supply changes for ~1% of coins per tick
+        bump = rng.random(n_coins) < 0.01
+        supply = np.where(bump, supply + rng.integers(1, 1000, n_coins), supply)
+        df = pd.DataFrame({
+            "id": ids,
+            "coin_name": names,
+            "coin_symbol": symbols,
+            "price": price,
+            "pct_1h": rng.normal(0, 1, n_coins),
+            "pct_24h": rng.normal(0, 3, n_coins),
+            "pct_7d": rng.normal(0, 8, n_coins),
+            "volume_24h": rng.lognormal(15, 2, n_coins),
+            "market_cap": price * supply,
+            "circulating_supply": supply,
+        })
+        ts = (start + dt.timedelta(minutes=every_minutes * step)).isoformat() + "Z"
+        yield ts, df
+
+
+def run(mode: str, args) -> dict:
+    fd, path = tempfile.mkstemp(suffix=f"_{mode}.db")
+    os.close(fd)
+    os.remove(path)
+    latencies = []
+    n = 0
+    for ts, df in simulated_snapshots(args.coins, args.days, args.every_minutes):
+        t0 = time.perf_counter()
+        append_snapshot(df, ts=ts, db_path=path, mode=mode)
+        latencies.append(time.perf_counter() - t0)
+        n += 1
+    t0 = time.perf_counter()
+    load_recent(db_path=path, limit=args.coins * 16, mode=mode)
+    read_ms = (time.perf_counter() - t0) * 1000.0
+    size = os.path.getsize(path)
+    os.remove(path)
+    lat = np.array(latencies) * 1000.0
+    return {
+        "mode": mode,
+        "snapshots": n,
+        "db_mb": round(size / 1e6, 1),
+        "bytes_per_snapshot": round(size / n),
+        "write_p50_ms": round(float(np.percentile(lat, 50)), 2),
+        "write_p99_ms": round(float(np.percentile(lat, 99)), 2),
+        "load_recent_ms": round(read_ms, 1),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare wide vs normalized snapshot storage on a simulated log.")
+    ap.add_argument("--coins", type=int, default=200)
+    ap.add_argument("--days", type=int, default=182)
+    ap.add_argument("--every_minutes", type=int, default=15)
+    args = ap.parse_args()
+
+    rows = [run(mode, args) for mode in ["wide", "normalized"]]
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,23 @@ import schedule
 
 from src.data import FetchConfig, fetch_markets
 from src.analytics import add_derived_columns
-from src.storage import append_snapshot
+from src.storage import append_snapshot, ensure_series_index, ensure_ts_index
+from src.ringbuffer import DEFAULT_RING_PATH, SnapshotRing
 
 
-def job(source: str, per_page: int):
-    ts = dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+def job(source: str, per_page: int, ring: SnapshotRing | None = None, storage: str = "wide"):
+    now = dt.datetime.utcnow().replace(microsecond=0)
+    ts = now.isoformat() + "Z"
     cfg = FetchConfig(source=source, per_page=per_page)
     df = fetch_markets(cfg)
     df = add_derived_columns(df)
-    append_snapshot(df, ts=ts)
+    append_snapshot(df, ts=ts, mode=storage)
+    if ring is not None:
+        # the ring is a cache for the dashboard; never let it stop SQLite logging
+        try:
+            ring.append(df, ts=now.replace(tzinfo=dt.timezone.utc).timestamp())
+        except Exception as e:
+            print(f"[{ts}] Ring buffer write failed: {e}")
     print(f"[{ts}] Logged {len(df)} coins")
 
 
@@ -24,10 +32,26 @@ def main():
     ap.add_argument("--source", default="coingecko", choices=["coingecko", "coinmarketcap_scrape"])
     ap.add_argument("--per_page", type=int, default=200)
     ap.add_argument("--every_minutes", type=int, default=15)
+    ap.add_argument("--ring_path", default=DEFAULT_RING_PATH)
+    ap.add_argument("--ring_capacity", type=int, default=288)
+    ap.add_argument("--no_ring", action="store_true")
+    ap.add_argument("--storage", default="wide", choices=["wide", "normalized"],
+                    help="normalized: coins dimension + narrow fact table, supply written only on change")
     args = ap.parse_args()
 
-    job(args.source, args.per_page)
-    schedule.every(args.every_minutes).minutes.do(job, args.source, args.per_page)
+    ensure_series_index(mode=args.storage)
+    if args.storage == "wide":
+        # the dashboard's concentration history range-scans on ts
+        ensure_ts_index()
+    ring = None
+    if not args.no_ring:
+        try:
+            ring = SnapshotRing(args.ring_path, writable=True, capacity=args.ring_capacity)
+        except ValueError as e:
+            ap.error(str(e))
+
+    job(args.source, args.per_page, ring, args.storage)
+    schedule.every(args.every_minutes).minutes.do(job, args.source, args.per_page, ring, args.storage)
 
     while True:
         schedule.run_pending()
@@ -120,11 +120,8 @@ def pie_top5_volume_with_others(df: pd.DataFrame, price_cat: str) -> pd.DataFram
         d = d[d["price_category_0_50"] == price_cat].copy()
 
     d = d.sort_values("volume_24h", ascending=False)
-    top5 = d.head(5).copy()
-    others = d.iloc[5:].copy()
-
-    rows = [{"coin_name": r["coin_name"], "volume_24h": float(r["volume_24h"])} for _, r in top5.iterrows()]
-    if not others.empty:
-        rows.append({"coin_name": "Others", "volume_24h": float(others["volume_24h"].sum())})
-
-    return pd.DataFrame(rows)
+    pie = d.head(5)[["coin_name", "volume_24h"]].astype({"volume_24h": float}).reset_index(drop=True)
+    if d.shape[0] > 5:
+        others = pd.DataFrame([{"coin_name": "Others", "volume_24h": float(d["volume_24h"].iloc[5:].sum())}])
+        pie = pd.concat([pie, others], ignore_index=True)
+    return pie
@@ -4,7 +4,8 @@ import pandas as pd
 import requests
 from dataclasses import dataclass
 from typing import Literal
-from bs4 import BeautifulSoup
+
+from src.perf import lazy_import
 
 
 USER_AGENT = "Mozilla/5.0 (CryptoDashboard; +https://streamlit.io)"
@@ -57,6 +58,8 @@ def fetch_coinmarketcap_scrape(limit: int = 200, timeout: int = 30) -> pd.DataFr
     r = requests.get(url, headers=headers, timeout=timeout)
     r.raise_for_status()
 
+    # bs4/lxml are only needed for this source, keep them off the cold-start path
+    BeautifulSoup = lazy_import("bs4").BeautifulSoup
     soup = BeautifulSoup(r.text, "lxml")
     rows = soup.select("table tbody tr")
     records = []
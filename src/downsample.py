@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def lttb_batch(x: np.ndarray, y: np.ndarray, offsets: np.ndarray, lengths: np.ndarray, n_out: int) -> np.ndarray:
+    """LTTB over many series laid end to end in ``x``/``y``; returns global indices of the kept points.
+
+    Series ``s`` occupies ``[offsets[s], offsets[s] + lengths[s])``, sorted by x, with no NaN in y.
+    All series advance bucket by bucket together, so the Python loop runs ``n_out`` times in total
+    rather than once per bucket per series.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    if n_out < 3:
+        return np.concatenate([np.arange(o, o + n) for o, n in zip(offsets, lengths)] or [np.empty(0, np.int64)])
+
+    short = lengths <= n_out
+    kept = [np.arange(o, o + n) for o, n in zip(offsets[short], lengths[short])]
+    offsets, lengths = offsets[~short], lengths[~short]
+    if lengths.size:
+        x = x.astype(np.float64)
+        y = y.astype(np.float64)
+        # inner points of each series split into n_out-2 buckets, as global index edges
+        # integer division: float edges can land one point off where a boundary is a whole number
+        edges = np.arange(n_out - 1)[None, :] * (lengths[:, None] - 2) // (n_out - 2)
+        edges += offsets[:, None] + 1
+        # bucket sums per series with reduceat; a running total across all series would lose
+        # the precision of small-valued coins that follow large ones. The last segment of each
+        # row spans into the next series and is discarded.
+        width = np.diff(edges, axis=1)
+        avg_x = np.add.reduceat(x, edges.ravel()).reshape(edges.shape)[:, :-1] / width
+        avg_y = np.add.reduceat(y, edges.ravel()).reshape(edges.shape)[:, :-1] / width
+        last = offsets + lengths - 1
+        # the "next bucket" for the last inner bucket is the final point
+        next_x = np.concatenate([avg_x[:, 1:], x[last][:, None]], axis=1)
+        next_y = np.concatenate([avg_y[:, 1:], y[last][:, None]], axis=1)
+
+        out = np.empty((lengths.size, n_out), dtype=np.int64)
+        out[:, 0] = offsets
+        out[:, -1] = last
+        a = offsets.copy()
+        for i in range(n_out - 2):
+            lo, hi = edges[:, i], edges[:, i + 1]
+            idx = lo[:, None] + np.arange(int((hi - lo).max()))[None, :]
+            valid = idx < hi[:, None]
+            idx = np.where(valid, idx, lo[:, None])
+            ax, ay = x[a][:, None], y[a][:, None]
+            area = np.abs((ax - next_x[:, i:i + 1]) * (y[idx] - ay) - (ax - x[idx]) * (next_y[:, i:i + 1] - ay))
+            area[~valid] = -1.0
+            a = idx[np.arange(idx.shape[0]), area.argmax(axis=1)]
+            out[:, i + 1] = a
+        kept.extend(out)
+    return np.sort(np.concatenate(kept)) if kept else np.empty(0, np.int64)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the Largest-Triangle-Three-Buckets subset of (x, y), first and last point kept.
+
+    ``x`` must be sorted and ``y`` free of NaN.
+    """
+    return lttb_batch(x, y, np.array([0]), np.array([x.size]), n_out)
+
+
+def minmax(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the min and max point in each of ~``n_out // 2`` equal-size buckets, in x order."""
+    n = x.size
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+
+    width = -(-n // (n_out // 2))
+    n_buckets = -(-n // width)
+    pad = n_buckets * width - n
+    y = y.astype(np.float64)
+    lo = np.concatenate([y, np.full(pad, np.inf)]).reshape(n_buckets, width).argmin(axis=1)
+    hi = np.concatenate([y, np.full(pad, -np.inf)]).reshape(n_buckets, width).argmax(axis=1)
+    base = np.arange(n_buckets) * width
+    return np.unique(np.concatenate([base + lo, base + hi, [0, n - 1]]))
+
+
+def downsample_series(df: pd.DataFrame, n_out: int, method: str = "lttb",
+                      x: str = "ts", y: str = "value", by: str = "coin_id") -> pd.DataFrame:
+    """Downsample each ``by`` group of a long frame (sorted by ``x``) to at most ~``n_out`` points."""
+    d = df[df[y].notna()]
+    if d.empty:
+        return d
+    codes = d.groupby(by, sort=False).ngroup().to_numpy()
+    # stable: keeps each group in x order
+    d = d.iloc[np.argsort(codes, kind="stable")]
+    lengths = np.bincount(codes)
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+
+    if pd.api.types.is_datetime64_any_dtype(d[x]):
+        xs = d[x].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    else:
+        xs = d[x].to_numpy()
+    ys = d[y].to_numpy(dtype=np.float64)
+
+    if method == "lttb":
+        keep = lttb_batch(xs, ys, offsets, lengths, n_out)
+    elif method == "minmax":
+        keep = np.concatenate([o + minmax(xs[o:o + n], ys[o:o + n], n_out) for o, n in zip(offsets, lengths)])
+    else:
+        raise ValueError(f"unknown downsampling method {method!r}, expected 'lttb' or 'minmax'")
+    return d.iloc[keep].reset_index(drop=True)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.analytics import PRICE_BINS
+
+
+def price_bucket(price: pd.Series) -> pd.Categorical:
+    edges = [lo for lo, _, _ in PRICE_BINS] + [PRICE_BINS[-1][1]]
+    labels = [label for _, _, label in PRICE_BINS]
+    return pd.cut(pd.to_numeric(price, errors="coerce"), bins=edges, labels=labels, right=False)
+
+
+def _sorted_groups(df: pd.DataFrame, by: List[str], value: str):
+    d = df.dropna(subset=by + [value])
+    v = pd.to_numeric(d[value], errors="coerce").to_numpy(dtype=np.float64)
+    keep = np.isfinite(v) & (v >= 0)
+    d, v = d[keep], v[keep]
+
+    grouped = d.groupby(by, observed=True, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    keys = grouped.size().index
+
+    # one sort for everything: by group, then value descending
+    order = np.lexsort((-v, codes))
+    codes, v = codes[order], v[order]
+
+    n_groups = len(keys)
+    n = np.bincount(codes, minlength=n_groups)
+    total = np.bincount(codes, weights=v, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(n)[:-1]])
+    rank = np.arange(v.size) - starts[codes]
+    return d.iloc[order], keys, codes, v, n, total, starts, rank
+
+
+def volume_share_curve(df: pd.DataFrame, by: Optional[List[str]] = None, value: str = "volume_24h") -> pd.DataFrame:
+    """Per-coin rank, share and cumulative share of ``value`` within each group, largest first."""
+    by = by or ["price_range"]
+    d, _, codes, v, _, total, starts, rank = _sorted_groups(df, by, value)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        share = v / total[codes]
+    cum = np.cumsum(v)
+    group_offset = np.concatenate([[0.0], cum])[starts]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cum_share = (cum - group_offset[codes]) / total[codes]
+
+    cols = [c for c in by + ["coin_name", "coin_symbol"] if c in d.columns]
+    out = d[cols].reset_index(drop=True)
+    out[value] = v
+    out["rank"] = rank + 1
+    out["share"] = share
+    out["cum_share"] = cum_share
+    return out
+
+
+def concentration(df: pd.DataFrame, by: Optional[List[str]] = None, value: str = "volume_24h",
+                  top_n: int = 5) -> pd.DataFrame:
+    """Top-N share, Herfindahl-Hirschman index (0-10,000) and Gini coefficient of ``value`` per group."""
+    by = by or ["price_range"]
+    _, keys, codes, v, n, total, _, rank = _sorted_groups(df, by, value)
+    if v.size == 0:
+        return pd.DataFrame(columns=by + ["n_coins", "total", "top_n_share", "hhi", "gini"])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        share = v / total[codes]
+        top_share = np.bincount(codes, weights=np.where(rank < top_n, share, 0.0), minlength=len(keys))
+        hhi = np.bincount(codes, weights=share * share, minlength=len(keys)) * 10000.0
+        # rank 0 is the largest value, i.e. position n in ascending order
+        weighted = np.bincount(codes, weights=(n[codes] - rank) * v, minlength=len(keys))
+        gini = 2.0 * weighted / (n * total) - (n + 1.0) / n
+
+    out = keys.to_frame(index=False) if isinstance(keys, pd.MultiIndex) else pd.DataFrame({by[0]: keys})
+    out["n_coins"] = n
+    out["total"] = total
+    out["top_n_share"] = top_share
+    out["hhi"] = hhi
+    out["gini"] = gini
+    return out
+
+
+def concentration_history(hist: pd.DataFrame, value: str = "volume_24h", top_n: int = 5,
+                          bucket_col: str = "price_range") -> pd.DataFrame:
+    """Concentration per (ts, price bucket) over a ``market_snapshots``-shaped history in one pass."""
+    h = hist
+    if bucket_col not in h.columns:
+        h = h.assign(**{bucket_col: price_bucket(h["price"])})
+    out = concentration(h, by=["ts", bucket_col], value=value, top_n=top_n)
+    return out.sort_values(["ts", bucket_col]).reset_index(drop=True)
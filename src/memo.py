@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import pandas as pd
+
+
+def snapshot_version(df: pd.DataFrame) -> str:
+    return str(df.attrs.get("snapshot_version", ""))
+
+
+def freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(freeze(v) for v in value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    return value
+
+
+def estimate_bytes(value: Any) -> int:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    if isinstance(value, dict):
+        return sum(estimate_bytes(v) for v in value.values()) + 64 * len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_bytes(v) for v in value) + 8 * len(value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 1024
+
+
+class ModuleMemo:
+    """LRU cache for per-module results keyed by (snapshot version, module, widget inputs).
+
+    Cached values are shared between reruns and sessions, callers must treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, version: str, module: str, inputs: Any, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        key = (version, module, freeze(inputs))
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[0]
+            self.misses += 1
+
+        value = fn(*args, **kwargs)
+        size = estimate_bytes(value)
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes_used -= old[1]
+            self._items[key] = (value, size)
+            self.bytes_used += size
+            while self._items and (len(self._items) > self.max_entries or self.bytes_used > self.max_bytes):
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.bytes_used -= evicted
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.bytes_used = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._items),
+            "bytes": self.bytes_used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
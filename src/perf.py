@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import functools
+import importlib
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Tuple
+
+
+# seconds spent importing each lazily loaded module (first import only)
+import_times: Dict[str, float] = {}
+
+
+def lazy_import(name: str):
+    mod = sys.modules.get(name)
+    if mod is not None:
+        return mod
+    t0 = time.perf_counter()
+    mod = importlib.import_module(name)
+    import_times[name] = time.perf_counter() - t0
+    return mod
+
+
+def record_import(name: str, seconds: float) -> None:
+    import_times.setdefault(name, seconds)
+
+
+class PerfLog:
+    def __init__(self, history: int = 20):
+        self.sections: Dict[str, float] = {}
+        self.reruns: Deque[float] = deque(maxlen=history)
+        # every timed call, including fragment-only reruns that never reach start_run/end_run
+        self.calls: Deque[Tuple[str, float]] = deque(maxlen=history)
+        self._start = None
+
+    def start_run(self) -> None:
+        self.sections = {}
+        self._start = time.perf_counter()
+
+    def end_run(self) -> float:
+        if self._start is None:
+            return 0.0
+        total = time.perf_counter() - self._start
+        self.reruns.append(total)
+        self._start = None
+        return total
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections[name] = time.perf_counter() - t0
+
+    def time_calls(self, name: str) -> Callable:
+        def decorate(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    elapsed = time.perf_counter() - t0
+                    self.sections[name] = elapsed
+                    self.calls.append((name, elapsed))
+            return wrapper
+        return decorate
+
+    def interaction_report(self) -> List[Dict[str, Any]]:
+        return [{"module": k, "ms": round(v * 1000.0, 1)} for k, v in reversed(self.calls)]
+
+    def import_report(self) -> List[Dict[str, Any]]:
+        return [
+            {"module": k, "import_ms": round(v * 1000.0, 1)}
+            for k, v in sorted(import_times.items(), key=lambda kv: -kv[1])
+        ]
+
+    def rerun_report(self) -> List[Dict[str, Any]]:
+        return [{"section": k, "ms": round(v * 1000.0, 1)} for k, v in self.sections.items()]
+
+    def rerun_summary(self) -> Dict[str, float]:
+        if not self.reruns:
+            return {"last_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0, "runs": 0}
+        vals = list(self.reruns)
+        return {
+            "last_ms": round(vals[-1] * 1000.0, 1),
+            "mean_ms": round(sum(vals) / len(vals) * 1000.0, 1),
+            "max_ms": round(max(vals) * 1000.0, 1),
+            "runs": len(vals),
+        }
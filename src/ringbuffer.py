@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_RING_PATH = "data/snapshots.ring"
+
+RING_FIELDS = ["price", "pct_1h", "pct_24h", "pct_7d", "volume_24h", "market_cap", "circulating_supply"]
+
+# header layout (int64 words)
+MAGIC = 0x414C50484152494E  # "ALPHARIN"
+H_MAGIC, H_SEQ, H_CAPACITY, H_SLOTS, H_FIELDS, H_HEAD, H_SLOTMAP_VERSION = range(7)
+HEADER_WORDS = 8
+HEADER_BYTES = HEADER_WORDS * 8
+
+
+def slotmap_path(path: str) -> str:
+    return str(path) + ".slots.json"
+
+
+def coin_key_column(df: pd.DataFrame) -> Optional[str]:
+    for col in ["id", "coin_id", "coin_name"]:
+        if col in df.columns:
+            return col
+    return None
+
+
+class SnapshotRing:
+    """Fixed-layout time x coin x field ring of recent snapshots in a memory-mapped file.
+
+    One writer (logger.py) appends snapshots; any number of reader processes map the
+    same file read-only. Consistency uses a seqlock: the writer makes the sequence
+    counter odd while it writes and even again when done, readers retry if the
+    counter was odd or moved during their copy. Coins are mapped to stable column
+    slots through a JSON sidecar so the coin universe can change between ticks.
+    """
+
+    def __init__(self, path: str = DEFAULT_RING_PATH, writable: bool = False,
+                 capacity: int = 288, n_slots: int = 512):
+        self.path = str(path)
+        self.writable = writable
+        if writable and not Path(self.path).exists():
+            self._create(capacity, n_slots)
+        self._map()
+        if writable:
+            if (self.capacity, self.n_slots) != (capacity, n_slots):
+                raise ValueError(
+                    f"{self.path} was created with capacity={self.capacity}, n_slots={self.n_slots}; "
+                    f"requested capacity={capacity}, n_slots={n_slots}. Delete the file to resize it."
+                )
+            # a writer killed mid-append leaves the seqlock odd; readers would spin on it forever
+            if int(self._header[H_SEQ]) & 1:
+                self._header[H_SEQ] += 1
+        self._slots: Dict[str, int] = {}
+        self._last_seen: Dict[int, int] = {}
+        self._slots_version = -1
+        self._load_slotmap()
+
+    def _create(self, capacity: int, n_slots: int) -> None:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        n_fields = len(RING_FIELDS)
+        size = HEADER_BYTES + capacity * 8 + capacity * n_slots * n_fields * 8
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as fh:
+            fh.truncate(size)
+        header = np.memmap(tmp, dtype=np.int64, mode="r+", shape=(HEADER_WORDS,))
+        header[:] = 0
+        header[H_MAGIC] = MAGIC
+        header[H_CAPACITY] = capacity
+        header[H_SLOTS] = n_slots
+        header[H_FIELDS] = n_fields
+        ts = np.memmap(tmp, dtype=np.float64, mode="r+", offset=HEADER_BYTES, shape=(capacity,))
+        ts[:] = np.nan
+        values = np.memmap(tmp, dtype=np.float64, mode="r+", offset=HEADER_BYTES + capacity * 8,
+                           shape=(capacity, n_slots, n_fields))
+        values[:] = np.nan
+        header.flush()
+        ts.flush()
+        values.flush()
+        del header, ts, values
+        os.replace(tmp, self.path)
+        self._write_slotmap_file({}, {}, 0)
+
+    def _map(self) -> None:
+        mode = "r+" if self.writable else "r"
+        self._header = np.memmap(self.path, dtype=np.int64, mode=mode, shape=(HEADER_WORDS,))
+        if int(self._header[H_MAGIC]) != MAGIC:
+            raise ValueError(f"{self.path} is not a snapshot ring buffer")
+        self.capacity = int(self._header[H_CAPACITY])
+        self.n_slots = int(self._header[H_SLOTS])
+        n_fields = int(self._header[H_FIELDS])
+        if n_fields != len(RING_FIELDS):
+            raise ValueError(f"{self.path} has {n_fields} fields, expected {len(RING_FIELDS)}")
+        self._ts = np.memmap(self.path, dtype=np.float64, mode=mode, offset=HEADER_BYTES,
+                             shape=(self.capacity,))
+        self._values = np.memmap(self.path, dtype=np.float64, mode=mode,
+                                 offset=HEADER_BYTES + self.capacity * 8,
+                                 shape=(self.capacity, self.n_slots, n_fields))
+
+    def _write_slotmap_file(self, slots: Dict[str, int], last_seen: Dict[int, int], version: int) -> None:
+        payload = {
+            "version": version,
+            "slots": {k: [s, last_seen.get(s, -1)] for k, s in slots.items()},
+        }
+        target = slotmap_path(self.path)
+        tmp = target + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh)
+        os.replace(tmp, target)
+
+    def _load_slotmap(self) -> int:
+        try:
+            with open(slotmap_path(self.path), encoding="utf-8") as fh:
+                payload = json.load(fh)
+        except FileNotFoundError:
+            payload = {"version": 0, "slots": {}}
+        self._slots = {k: int(v[0]) for k, v in payload["slots"].items()}
+        self._last_seen = {int(v[0]): int(v[1]) for v in payload["slots"].values()}
+        self._slots_version = int(payload["version"])
+        return self._slots_version
+
+    @property
+    def head(self) -> int:
+        return int(self._header[H_HEAD])
+
+    def _assign_slots(self, keys: List[str], head: int) -> Tuple[np.ndarray, bool]:
+        changed = False
+        used = set(self._slots.values())
+        free = [s for s in range(self.n_slots) if s not in used]
+        free.reverse()
+        out = np.empty(len(keys), dtype=np.int64)
+        incoming = set(keys)
+        for i, key in enumerate(keys):
+            slot = self._slots.get(key)
+            if slot is None:
+                if free:
+                    slot = free.pop()
+                else:
+                    # evict the coin that has been absent the longest
+                    # append() checked len(keys) <= n_slots, so a candidate always exists
+                    candidates = [(self._last_seen.get(s, -1), k, s) for k, s in self._slots.items()
+                                  if k not in incoming]
+                    _, old_key, slot = min(candidates)
+                    del self._slots[old_key]
+                    self._values[:, slot, :] = np.nan
+                self._slots[key] = slot
+                changed = True
+            self._last_seen[slot] = head
+            out[i] = slot
+        return out, changed
+
+    def append(self, df: pd.DataFrame, ts: float) -> None:
+        if not self.writable:
+            raise PermissionError("ring buffer opened read-only")
+        key_col = coin_key_column(df)
+        if key_col is None or df.empty:
+            return
+
+        x = df.dropna(subset=[key_col]).drop_duplicates(subset=[key_col])
+        keys = x[key_col].astype(str).tolist()
+        # new coins fit in free + evictable slots exactly when the snapshot has at most n_slots coins;
+        # check before touching the slot map or the mapped file
+        if len(keys) > self.n_slots:
+            raise ValueError(f"snapshot has {len(keys)} coins but the ring buffer has only {self.n_slots} slots")
+        block = np.full((self.n_slots, len(RING_FIELDS)), np.nan)
+        vals = x.reindex(columns=RING_FIELDS).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+
+        head = self.head
+        row = head % self.capacity
+
+        self._header[H_SEQ] += 1
+        try:
+            slots, changed = self._assign_slots(keys, head)
+            block[slots] = vals
+            self._values[row] = block
+            self._ts[row] = ts
+            if changed:
+                self._slots_version += 1
+            self._write_slotmap_file(self._slots, self._last_seen, self._slots_version)
+            self._header[H_SLOTMAP_VERSION] = self._slots_version
+            self._header[H_HEAD] = head + 1
+        finally:
+            self._header[H_SEQ] += 1
+
+    def flush(self) -> None:
+        self._values.flush()
+        self._ts.flush()
+        self._header.flush()
+
+    def read_window(self, n: Optional[int] = None, fields: Optional[List[str]] = None,
+                    retries: int = 1000) -> Tuple[np.ndarray, np.ndarray, Dict[str, int]]:
+        """Return (ts, values, slots) for the last ``n`` snapshots, oldest first.
+
+        ``values`` has shape (n, n_slots, len(fields)); ``slots`` maps coin id to column.
+        """
+        field_idx = [RING_FIELDS.index(f) for f in (fields or RING_FIELDS)]
+        for _ in range(retries):
+            s1 = int(self._header[H_SEQ])
+            if s1 & 1:
+                time.sleep(0)
+                continue
+            head = int(self._header[H_HEAD])
+            version = int(self._header[H_SLOTMAP_VERSION])
+            k = min(head, self.capacity) if n is None else min(int(n), head, self.capacity)
+            rows = (head - k + np.arange(k)) % self.capacity
+            ts = self._ts[rows]
+            values = self._values[rows][:, :, field_idx]
+            if int(self._header[H_SEQ]) != s1:
+                continue
+            if version != self._slots_version and self._load_slotmap() != version:
+                continue
+            return np.asarray(ts), np.asarray(values), dict(self._slots)
+        raise RuntimeError(f"could not get a consistent read of {self.path}")
+
+    def series(self, coin: str, field: str = "price", n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        ts, values, slots = self.read_window(n, fields=[field])
+        slot = slots.get(str(coin))
+        if slot is None:
+            return ts[:0], values[:0, 0, 0]
+        return ts, values[:, slot, 0]
+
+    def recent_frame(self, coins: List[str], field: str = "price", n: Optional[int] = None) -> pd.DataFrame:
+        """Long (ts, coin_id, value) frame of the last ``n`` snapshots for a few coins."""
+        ts, values, slots = self.read_window(n, fields=[field])
+        parts = []
+        for coin in coins:
+            slot = slots.get(str(coin))
+            if slot is not None:
+                parts.append(pd.DataFrame({"ts": ts, "coin_id": str(coin), "value": values[:, slot, 0]}))
+        if not parts:
+            return pd.DataFrame(columns=["ts", "coin_id", "value"])
+        out = pd.concat(parts, ignore_index=True).dropna(subset=["value"])
+        out["ts"] = pd.to_datetime(out["ts"], unit="s", utc=True)
+        return out
+
+    def rolling_stats(self, field: str = "price", n: int = 16) -> pd.DataFrame:
+        ts, values, slots = self.read_window(n, fields=[field])
+        if ts.size == 0 or not slots:
+            return pd.DataFrame(columns=["coin_id", "last", "mean", "std", "min", "max", "pct_change", "samples"])
+
+        keys = list(slots.keys())
+        cols = np.fromiter(slots.values(), dtype=np.int64, count=len(keys))
+        v = values[:, cols, 0]
+        present = ~np.isnan(v)
+        samples = present.sum(axis=0)
+        keep = samples > 0
+        v, present, samples = v[:, keep], present[:, keep], samples[keep]
+        keys = [k for k, ok in zip(keys, keep) if ok]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            first_idx = present.argmax(axis=0)
+            last_idx = v.shape[0] - 1 - present[::-1].argmax(axis=0)
+            cols_range = np.arange(v.shape[1])
+            first = v[first_idx, cols_range]
+            last = v[last_idx, cols_range]
+            out = pd.DataFrame({
+                "coin_id": keys,
+                "last": last,
+                "mean": np.nanmean(v, axis=0),
+                "std": np.nanstd(v, axis=0),
+                "min": np.nanmin(v, axis=0),
+                "max": np.nanmax(v, axis=0),
+                "pct_change": (last / first - 1.0) * 100.0,
+                "samples": samples,
+            })
+        return out.sort_values("last", ascending=False).reset_index(drop=True)
@@ -2,9 +2,19 @@ from __future__ import annotations
 
 import sqlite3
 from pathlib import Path
+from typing import List, Optional
 import pandas as pd
 
 
+STORAGE_MODES = ("wide", "normalized")
+
+
+def check_mode(mode: str) -> str:
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"unknown storage mode {mode!r}, expected one of {STORAGE_MODES}")
+    return mode
+
+
 def init_db(db_path: str = "data/crypto.db") -> str:
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     with sqlite3.connect(db_path) as con:
@@ -29,7 +39,10 @@ def init_db(db_path: str = "data/crypto.db") -> str:
     return db_path
 
 
-def append_snapshot(df: pd.DataFrame, ts: str, db_path: str = "data/crypto.db") -> None:
+def append_snapshot(df: pd.DataFrame, ts: str, db_path: str = "data/crypto.db", mode: str = "wide") -> None:
+    check_mode(mode)
+    if mode == "normalized":
+        return append_snapshot_normalized(df, ts=ts, db_path=db_path)
     init_db(db_path)
     cols = ["id", "coin_name", "coin_symbol", "price", "pct_1h", "pct_24h", "pct_7d", "volume_24h", "market_cap", "circulating_supply"]
     x = df.copy()
@@ -39,8 +52,257 @@ def append_snapshot(df: pd.DataFrame, ts: str, db_path: str = "data/crypto.db")
         x.to_sql("market_snapshots", con, if_exists="append", index=False)
 
 
-def load_recent(db_path: str = "data/crypto.db", limit: int = 2000) -> pd.DataFrame:
+def load_recent(db_path: str = "data/crypto.db", limit: int = 2000, mode: str = "wide") -> pd.DataFrame:
+    check_mode(mode)
+    if mode == "normalized":
+        return load_recent_normalized(db_path=db_path, limit=limit)
     init_db(db_path)
     with sqlite3.connect(db_path) as con:
         q = f"SELECT * FROM market_snapshots ORDER BY ts DESC LIMIT {int(limit)}"
         return pd.read_sql_query(q, con)
+
+
+FACT_COLS = ["price", "pct_1h", "pct_24h", "pct_7d", "volume_24h", "market_cap"]
+
+
+def init_normalized_db(db_path: str = "data/crypto.db") -> str:
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    with sqlite3.connect(db_path) as con:
+        con.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS coins (
+                coin_key INTEGER PRIMARY KEY,
+                coin_id TEXT NOT NULL UNIQUE,
+                coin_name TEXT,
+                coin_symbol TEXT,
+                last_supply REAL
+            );
+            CREATE TABLE IF NOT EXISTS snapshots (
+                ts_id INTEGER PRIMARY KEY,
+                ts TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS market_facts (
+                ts_id INTEGER NOT NULL,
+                coin_key INTEGER NOT NULL,
+                price REAL,
+                pct_1h REAL,
+                pct_24h REAL,
+                pct_7d REAL,
+                volume_24h REAL,
+                market_cap REAL,
+                PRIMARY KEY (ts_id, coin_key)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS supply_changes (
+                coin_key INTEGER NOT NULL,
+                ts_id INTEGER NOT NULL,
+                circulating_supply REAL,
+                PRIMARY KEY (coin_key, ts_id)
+            ) WITHOUT ROWID;
+            """
+        )
+    return db_path
+
+
+def _same(a, b) -> bool:
+    if pd.isna(a) and pd.isna(b):
+        return True
+    return a == b
+
+
+def append_snapshot_normalized(df: pd.DataFrame, ts: str, db_path: str = "data/crypto.db") -> None:
+    init_normalized_db(db_path)
+    x = df.dropna(subset=["id"]).drop_duplicates(subset=["id"])
+    with sqlite3.connect(db_path) as con:
+        known = {
+            row[0]: row[1:]
+            for row in con.execute("SELECT coin_id, coin_key, coin_name, coin_symbol, last_supply FROM coins")
+        }
+
+        new_coins = []
+        renamed = []
+        for coin_id, name, symbol in zip(x["id"], x["coin_name"], x["coin_symbol"]):
+            prev = known.get(coin_id)
+            if prev is None:
+                new_coins.append((coin_id, name, symbol))
+            elif prev[1] != name or prev[2] != symbol:
+                renamed.append((name, symbol, prev[0]))
+        if new_coins:
+            con.executemany("INSERT INTO coins (coin_id, coin_name, coin_symbol) VALUES (?, ?, ?)", new_coins)
+            known.update({
+                row[0]: row[1:]
+                for row in con.execute("SELECT coin_id, coin_key, coin_name, coin_symbol, last_supply FROM coins")
+            })
+        if renamed:
+            con.executemany("UPDATE coins SET coin_name = ?, coin_symbol = ? WHERE coin_key = ?", renamed)
+
+        # logging the same ts twice replaces that snapshot's rows instead of failing the logger loop
+        con.execute("INSERT OR IGNORE INTO snapshots (ts) VALUES (?)", (ts,))
+        ts_id = con.execute("SELECT ts_id FROM snapshots WHERE ts = ?", (ts,)).fetchone()[0]
+
+        keys = [known[c][0] for c in x["id"]]
+        # NaN binds as NULL in SQLite
+        facts = x[FACT_COLS].apply(pd.to_numeric, errors="coerce")
+        con.executemany(
+            "INSERT OR REPLACE INTO market_facts (ts_id, coin_key, price, pct_1h, pct_24h, pct_7d, volume_24h, market_cap) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(ts_id, k, *row) for k, row in zip(keys, facts.itertuples(index=False, name=None))],
+        )
+
+        changed = []
+        supply = pd.to_numeric(x["circulating_supply"], errors="coerce")
+        for k, coin_id, s in zip(keys, x["id"], supply):
+            if not _same(s, known[coin_id][3]):
+                changed.append((k, ts_id, None if pd.isna(s) else float(s)))
+        if changed:
+            con.executemany("INSERT OR REPLACE INTO supply_changes (coin_key, ts_id, circulating_supply) VALUES (?, ?, ?)", changed)
+            con.executemany("UPDATE coins SET last_supply = ? WHERE coin_key = ?", [(s, k) for k, _, s in changed])
+
+
+SNAPSHOT_COLS = ["ts", "coin_id", "coin_name", "coin_symbol"] + FACT_COLS + ["circulating_supply"]
+
+NORMALIZED_EXPRS = {
+    "ts": "s.ts",
+    "coin_id": "c.coin_id",
+    "coin_name": "c.coin_name",
+    "coin_symbol": "c.coin_symbol",
+    **{col: f"f.{col}" for col in FACT_COLS},
+    "circulating_supply": """(SELECT sc.circulating_supply FROM supply_changes sc
+             WHERE sc.coin_key = f.coin_key AND sc.ts_id <= f.ts_id
+             ORDER BY sc.ts_id DESC LIMIT 1) AS circulating_supply""",
+}
+
+
+def check_columns(columns: Optional[List[str]]) -> List[str]:
+    if columns is None:
+        return list(SNAPSHOT_COLS)
+    unknown = [c for c in columns if c not in SNAPSHOT_COLS]
+    if unknown:
+        raise ValueError(f"unknown snapshot columns {unknown}, expected a subset of {SNAPSHOT_COLS}")
+    return list(columns)
+
+
+def normalized_select(columns: Optional[List[str]] = None) -> str:
+    # CROSS JOIN pins snapshots as the outer loop so the ts index satisfies ORDER BY/LIMIT
+    # and the supply lookup only runs for the returned rows (and only when it is selected)
+    columns = check_columns(columns)
+    q = "SELECT " + ", ".join(NORMALIZED_EXPRS[c] for c in columns)
+    q += " FROM snapshots s CROSS JOIN market_facts f ON f.ts_id = s.ts_id"
+    if any(c.startswith("coin_") for c in columns):
+        q += " JOIN coins c ON c.coin_key = f.coin_key"
+    return q
+
+
+NORMALIZED_SELECT = normalized_select()
+
+
+def load_recent_normalized(db_path: str = "data/crypto.db", limit: int = 2000) -> pd.DataFrame:
+    init_normalized_db(db_path)
+    with sqlite3.connect(db_path) as con:
+        q = NORMALIZED_SELECT + " ORDER BY s.ts DESC LIMIT ?"
+        return pd.read_sql_query(q, con, params=(int(limit),))
+
+
+def load_range(db_path: str = "data/crypto.db", start: Optional[str] = None, end: Optional[str] = None,
+               mode: str = "wide", columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Snapshots with ``start <= ts < end`` (either bound optional), oldest first.
+
+    ``columns`` limits the result to a subset of ``SNAPSHOT_COLS``; the default is all of them.
+    """
+    check_mode(mode)
+    columns = check_columns(columns)
+    where, params = [], []
+    if start is not None:
+        where.append("{ts} >= ?")
+        params.append(start)
+    if end is not None:
+        where.append("{ts} < ?")
+        params.append(end)
+
+    if mode == "normalized":
+        init_normalized_db(db_path)
+        q = normalized_select(columns)
+        ts_col = "s.ts"
+    else:
+        init_db(db_path)
+        q = "SELECT " + ", ".join(columns) + " FROM market_snapshots"
+        ts_col = "ts"
+    if where:
+        q += " WHERE " + " AND ".join(w.format(ts=ts_col) for w in where)
+    q += f" ORDER BY {ts_col}"
+    with sqlite3.connect(db_path) as con:
+        return pd.read_sql_query(q, con, params=params)
+
+
+def list_timestamps(db_path: str = "data/crypto.db", mode: str = "wide") -> List[str]:
+    check_mode(mode)
+    if mode == "normalized":
+        init_normalized_db(db_path)
+        q = "SELECT ts FROM snapshots ORDER BY ts"
+    else:
+        init_db(db_path)
+        q = "SELECT DISTINCT ts FROM market_snapshots ORDER BY ts"
+    with sqlite3.connect(db_path) as con:
+        return [row[0] for row in con.execute(q)]
+
+
+def ensure_ts_index(db_path: str = "data/crypto.db") -> None:
+    # range scans over the wide table need this; the normalized schema has it via UNIQUE(ts)
+    init_db(db_path)
+    with sqlite3.connect(db_path) as con:
+        con.execute("CREATE INDEX IF NOT EXISTS idx_market_snapshots_ts ON market_snapshots (ts)")
+
+
+SERIES_FIELDS = ["price", "pct_1h", "pct_24h", "pct_7d", "volume_24h", "market_cap", "circulating_supply"]
+
+
+def ensure_series_index(db_path: str = "data/crypto.db", mode: str = "wide") -> None:
+    check_mode(mode)
+    # per-coin history reads (load_series) seek on (coin, ts) instead of scanning every snapshot
+    if mode == "normalized":
+        init_normalized_db(db_path)
+        q = "CREATE INDEX IF NOT EXISTS idx_market_facts_coin ON market_facts (coin_key, ts_id)"
+    else:
+        init_db(db_path)
+        q = "CREATE INDEX IF NOT EXISTS idx_market_snapshots_coin_ts ON market_snapshots (coin_id, ts)"
+    with sqlite3.connect(db_path) as con:
+        con.execute(q)
+
+
+def load_series(coin_ids: List[str], field: str = "price", db_path: str = "data/crypto.db",
+                start: Optional[str] = None, end: Optional[str] = None, mode: str = "wide") -> pd.DataFrame:
+    """Long (ts, coin_id, value) frame for a few coins, oldest first."""
+    check_mode(mode)
+    if field not in SERIES_FIELDS:
+        raise ValueError(f"unknown field {field!r}, expected one of {SERIES_FIELDS}")
+    if not coin_ids:
+        return pd.DataFrame(columns=["ts", "coin_id", "value"])
+
+    marks = ", ".join("?" for _ in coin_ids)
+    params: list = list(coin_ids)
+    if mode == "normalized":
+        init_normalized_db(db_path)
+        if field == "circulating_supply":
+            return (load_range(db_path, start=start, end=end, mode=mode)
+                    .query("coin_id in @coin_ids")[["ts", "coin_id", field]]
+                    .rename(columns={field: "value"}).reset_index(drop=True))
+        q = f"""
+            SELECT s.ts, c.coin_id, f.{field} AS value
+            FROM coins c
+            JOIN market_facts f ON f.coin_key = c.coin_key
+            JOIN snapshots s ON s.ts_id = f.ts_id
+            WHERE c.coin_id IN ({marks})
+        """
+        ts_col = "s.ts"
+    else:
+        init_db(db_path)
+        q = f"SELECT ts, coin_id, {field} AS value FROM market_snapshots WHERE coin_id IN ({marks})"
+        ts_col = "ts"
+    if start is not None:
+        q += f" AND {ts_col} >= ?"
+        params.append(start)
+    if end is not None:
+        q += f" AND {ts_col} < ?"
+        params.append(end)
+    q += f" ORDER BY {ts_col}"
+    with sqlite3.connect(db_path) as con:
+        return pd.read_sql_query(q, con, params=params)
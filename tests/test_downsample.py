@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from src.downsample import downsample_series, lttb, minmax
+
+
+def reference_lttb(x, y, n_out):
+    # textbook point-by-point LTTB, kept deliberately naive as an oracle for the vectorized version
+    n = len(x)
+    a = 0
+    out = [0]
+    for i in range(n_out - 2):
+        if i == n_out - 3:
+            avg_x, avg_y = x[-1], y[-1]
+        else:
+            lo = (i + 1) * (n - 2) // (n_out - 2) + 1
+            hi = (i + 2) * (n - 2) // (n_out - 2) + 1
+            avg_x, avg_y = x[lo:hi].mean(), y[lo:hi].mean()
+        lo = i * (n - 2) // (n_out - 2) + 1
+        hi = (i + 1) * (n - 2) // (n_out - 2) + 1
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        out.append(a)
+    out.append(n - 1)
+    return np.array(out)
+
+
+def reference_minmax(y, n_out):
+    width = -(-len(y) // (n_out // 2))
+    keep = {0, len(y) - 1}
+    for lo in range(0, len(y), width):
+        bucket = y[lo:lo + width]
+        keep.update([lo + int(bucket.argmin()), lo + int(bucket.argmax())])
+    return np.array(sorted(keep))
+
+
+def test_lttb_matches_reference_on_random_series():
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        n = int(rng.integers(3, 400))
+        n_out = int(rng.integers(3, n + 1))
+        x = np.sort(rng.uniform(0, 1e6, n))
+        y = np.cumsum(rng.normal(0, 1, n)) * 10.0 ** rng.integers(-8, 6)
+        np.testing.assert_array_equal(lttb(x, y, n_out), reference_lttb(x, y, n_out))
+
+
+def test_batch_matches_reference_with_mixed_magnitudes():
+    rng = np.random.default_rng(0)
+    n = 365 * 96
+    ts = pd.date_range("2025-01-01", periods=n, freq="15min", tz="UTC")
+    big = 1e5 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    small = 1e-8 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    df = pd.concat([
+        pd.DataFrame({"ts": ts, "coin_id": "bitcoin", "value": big}),
+        pd.DataFrame({"ts": ts, "coin_id": "memecoin", "value": small}),
+    ], ignore_index=True)
+
+    out = downsample_series(df, 1200)
+
+    xs = ts.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(np.float64)
+    for coin, y in [("bitcoin", big), ("memecoin", small)]:
+        expected = y[reference_lttb(xs, y, 1200)]
+        got = out.loc[out["coin_id"] == coin, "value"].to_numpy()
+        np.testing.assert_array_equal(got, expected)
+
+
+def test_minmax_keeps_bucket_extremes_and_endpoints():
+    rng = np.random.default_rng(2)
+    for _ in range(100):
+        n = int(rng.integers(3, 500))
+        n_out = int(rng.integers(2, n))
+        x = np.arange(n)
+        y = rng.normal(0, 1, n)
+        idx = minmax(x, y, n_out)
+        np.testing.assert_array_equal(idx, reference_minmax(y, n_out))
+        assert idx[0] == 0 and idx[-1] == n - 1
+        assert y.argmin() in idx and y.argmax() in idx